@@ -4,30 +4,33 @@ Version: 1.1.17 (Production - POST only, YAML profiles)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import json
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
-import requests
 import yaml
-from pycognito import Cognito
 import aiofiles
+from botocore.exceptions import ClientError
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.util.json import json_loads
 
+from .cognito import auth_result_expiry, get_idp_client
 from .const import (
     DOMAIN,
-    COGNITO_POOL_ID,
     COGNITO_CLIENT_ID,
-    COGNITO_REGION,
     SERVICE_SET_DAY,
     ATTR_NODE_ID,
     ATTR_DAY,
@@ -38,31 +41,53 @@ from .const import (
     CONF_REFRESH_TOKEN,
     CONF_TOKEN_EXPIRY,
 )
+from .exceptions import InvalidAuth
 
 _LOGGER = logging.getLogger(__name__)
 
-DEFAULT_SCAN_INTERVAL = timedelta(minutes=30)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# Refresh a few minutes before Cognito's expiry so a token never expires
+# mid-request
+TOKEN_REFRESH_BEFORE = 3 * 60
+# Failed refreshes back off from REFRESH_RETRY_DELAY up to REFRESH_RETRY_MAX_DELAY
+REFRESH_RETRY_DELAY = 60
+REFRESH_RETRY_MAX_DELAY = 30 * 60
 PROFILES_FILE = "hive_schedule_profiles.yaml"
 
+# Log separators
+_BANNER = "=" * 80
+_RULE = "-" * 80
+
+# Day names, Monday first; used by the day validator and to order the
+# readable schedule output
+_DAYS = (
+    "monday", "tuesday", "wednesday", "thursday",
+    "friday", "saturday", "sunday",
+)
+
+# Every canonical "HH:MM" mapped to minutes from midnight
+_TIME_TO_MINUTES = {
+    f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)
+}
+
+# Shared validators, built once and reused by the service schemas
+_DAY_VALIDATOR = vol.In(_DAYS)
+_SCHEDULE_VALIDATOR = vol.All(cv.ensure_list, [vol.Schema({
+    vol.Required("time"): cv.string,
+    vol.Required("temp"): vol.Coerce(float),
+})])
+
 # Service schema - profile validation at runtime
 SET_DAY_SCHEMA = vol.Schema({
     vol.Required(ATTR_NODE_ID): cv.string,
-    vol.Required(ATTR_DAY): vol.In([
-        "monday", "tuesday", "wednesday", "thursday", 
-        "friday", "saturday", "sunday"
-    ]),
+    vol.Required(ATTR_DAY): _DAY_VALIDATOR,
     vol.Optional(ATTR_PROFILE): cv.string,  # Validated at runtime
-    vol.Optional(ATTR_SCHEDULE): vol.All(cv.ensure_list, [{
-        vol.Required("time"): cv.string,
-        vol.Required("temp"): vol.Coerce(float),
-    }])
+    vol.Optional(ATTR_SCHEDULE): _SCHEDULE_VALIDATOR,
 })
 
 
-async def _load_profiles(hass: HomeAssistant) -> dict:
+async def _load_profiles(config_path: str) -> dict:
     """Load schedule profiles from YAML file asynchronously."""
-    config_path = hass.config.path(PROFILES_FILE)
-    
     # Create default profiles file if it doesn't exist
     if not os.path.exists(config_path):
         _LOGGER.info("Creating default profiles file: %s", config_path)
@@ -244,16 +269,70 @@ def _validate_schedule(schedule: list) -> bool:
     return True
 
 
+class _CircuitBreaker:
+    """Fail fast on Hive API calls after repeated transport failures.
+    
+    Closed while calls succeed. After failure_threshold consecutive failures
+    it opens for recovery_timeout seconds, during which calls are rejected
+    without touching the network. Once the timeout passes the next call is
+    let through as a probe: success closes the breaker, failure re-opens it.
+    """
+    
+    __slots__ = ("failure_threshold", "recovery_timeout", "consecutive_failures", "open_until")
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0) -> None:
+        """Initialize the circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+    
+    def check(self) -> None:
+        """Raise if the breaker is open, letting one probe through after the timeout."""
+        now = time.monotonic()
+        if now < self.open_until:
+            raise HomeAssistantError("Hive API unavailable")
+        if self.consecutive_failures >= self.failure_threshold:
+            # Half-open: this call is the probe; hold the others back until
+            # it succeeds or the next timeout passes
+            self.open_until = now + self.recovery_timeout
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.open_until = time.monotonic() + self.recovery_timeout
+            _LOGGER.warning(
+                "Hive API failed %d times in a row, pausing requests for %ds",
+                self.consecutive_failures, self.recovery_timeout
+            )
+
+
 class HiveAuth:
     """Handle Hive authentication via AWS Cognito."""
     
+    __slots__ = (
+        "hass", "entry", "username", "password",
+        "_unsub_refresh", "_retry_delay", "_unloaded", "_refresh_task", "_refresh_forced",
+        "_id_token", "_access_token", "_refresh_token", "_token_expiry", "_expires_at",
+    )
+    
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize Hive authentication."""
         self.hass = hass
         self.entry = entry
         self.username = entry.data[CONF_USERNAME]
         self.password = entry.data[CONF_PASSWORD]
-        self._cognito = None
+        self._unsub_refresh = None
+        self._retry_delay = REFRESH_RETRY_DELAY
+        self._unloaded = False
+        self._refresh_task = None
+        self._refresh_forced = False
         
         # Load tokens from config entry
         self._id_token = entry.data.get(CONF_ID_TOKEN)
@@ -264,17 +343,37 @@ class HiveAuth:
         expiry_str = entry.data.get(CONF_TOKEN_EXPIRY)
         if expiry_str:
             try:
-                self._token_expiry = datetime.fromisoformat(expiry_str)
+                self._set_expiry(datetime.fromisoformat(expiry_str))
             except (ValueError, TypeError):
-                self._token_expiry = None
+                self._set_expiry(None)
+        else:
+            self._set_expiry(None)
+    
+    def _set_expiry(self, expiry: datetime | None) -> None:
+        """Store the token expiry and its deadline on the monotonic clock.
+        
+        The datetime is what gets persisted; expiry checks compare against
+        the monotonic deadline so they are cheap and immune to clock jumps.
+        """
+        self._token_expiry = expiry
+        if expiry is None:
+            self._expires_at = 0.0
         else:
-            self._token_expiry = None
+            self._expires_at = time.monotonic() + (expiry - datetime.now()).total_seconds()
     
-    def refresh_token(self) -> bool:
-        """Refresh the authentication token using refresh token."""
+    def _is_expired(self) -> bool:
+        """Check if the token is within the early-refresh window of expiry."""
+        return time.monotonic() + TOKEN_REFRESH_BEFORE >= self._expires_at
+    
+    def refresh_token(self, force: bool = False) -> bool:
+        """Refresh the authentication token using refresh token.
+        
+        With force, refresh even if the token looks valid locally, e.g.
+        after Hive has rejected it.
+        """
         try:
             # Check if we need to refresh
-            if self._token_expiry and datetime.now() < self._token_expiry - timedelta(minutes=5):
+            if not force and not self._is_expired():
                 _LOGGER.debug("Token still valid, no refresh needed")
                 return True
             
@@ -284,31 +383,29 @@ class HiveAuth:
             
             _LOGGER.info("Refreshing authentication token...")
             
-            # Create Cognito instance
-            self._cognito = Cognito(
-                user_pool_id=COGNITO_POOL_ID,
-                client_id=COGNITO_CLIENT_ID,
-                user_pool_region=COGNITO_REGION,
-                username=self.username,
-                id_token=self._id_token,
-                access_token=self._access_token,
-                refresh_token=self._refresh_token,
+            # A single REFRESH_TOKEN_AUTH call; no password or MFA needed
+            response = get_idp_client().initiate_auth(
+                ClientId=COGNITO_CLIENT_ID,
+                AuthFlow="REFRESH_TOKEN_AUTH",
+                AuthParameters={"REFRESH_TOKEN": self._refresh_token},
             )
-            
-            # Refresh tokens
-            self._cognito.renew_access_token()
+            result = response["AuthenticationResult"]
             
             # Update stored tokens
-            self._id_token = self._cognito.id_token
-            self._access_token = self._cognito.access_token
-            self._token_expiry = datetime.now() + timedelta(minutes=55)
-            
-            # Save updated tokens to config entry
-            self._save_tokens()
+            self._id_token = result["IdToken"]
+            self._access_token = result["AccessToken"]
+            self._refresh_token = result.get("RefreshToken", self._refresh_token)
+            self._set_expiry(auth_result_expiry(result))
             
             _LOGGER.info("Successfully refreshed authentication token")
             return True
             
+        except ClientError as err:
+            # A revoked or expired refresh token will never succeed on retry
+            if err.response.get("Error", {}).get("Code") == "NotAuthorizedException":
+                raise InvalidAuth from err
+            _LOGGER.error("Failed to refresh token: %s", err)
+            return False
         except Exception as e:
             _LOGGER.error("Failed to refresh token: %s", e)
             return False
@@ -327,15 +424,93 @@ class HiveAuth:
         except Exception as e:
             _LOGGER.error("Failed to save tokens: %s", e)
     
+    async def async_refresh_token(self, force: bool = False) -> bool:
+        """Refresh the token, joining any refresh already in flight.
+        
+        The background timer and the 401 retry can ask for a refresh at the
+        same time; they share one Cognito call. A forced refresh does not
+        reuse an unforced one, which may have skipped Cognito.
+        
+        Raises InvalidAuth if Cognito rejects the refresh token.
+        """
+        while (task := self._refresh_task) is not None:
+            # Shield the shared task so a cancelled caller doesn't cancel it
+            if self._refresh_forced or not force:
+                return await asyncio.shield(task)
+            await asyncio.shield(task)
+        
+        self._refresh_forced = force
+        self._refresh_task = self.hass.async_create_task(self._async_refresh_token(force))
+        return await asyncio.shield(self._refresh_task)
+    
+    async def _async_refresh_token(self, force: bool) -> bool:
+        """Refresh the token in the executor, save it and schedule the next refresh."""
+        try:
+            refreshed = await self.hass.async_add_executor_job(self.refresh_token, force)
+        except InvalidAuth:
+            if self._unloaded:
+                return False
+            _LOGGER.error("Refresh token rejected by Hive, re-authentication required")
+            # Stop refreshing; the caller decides how to ask for a new login
+            self._refresh_token = None
+            self.async_cancel_refresh()
+            raise
+        finally:
+            # The executor job is the only await, so the refresh is over here
+            self._refresh_task = None
+        
+        # The entry may have been unloaded while the executor job ran
+        if self._unloaded:
+            return refreshed
+        
+        if refreshed:
+            # Config entries must be updated from the event loop
+            self._save_tokens()
+            self._retry_delay = REFRESH_RETRY_DELAY
+            delay = None
+        else:
+            delay = self._retry_delay
+            self._retry_delay = min(2 * self._retry_delay, REFRESH_RETRY_MAX_DELAY)
+        if self._refresh_token:
+            self.async_schedule_refresh(delay)
+        return refreshed
+    
+    @callback
+    def async_schedule_refresh(self, delay: float | None = None) -> None:
+        """Schedule a background refresh just before the token expires."""
+        self.async_cancel_refresh()
+        if delay is None:
+            delay = max(0.0, self._expires_at - TOKEN_REFRESH_BEFORE - time.monotonic())
+        self._unsub_refresh = async_call_later(
+            self.hass, delay, self._async_scheduled_refresh
+        )
+    
+    @callback
+    def async_cancel_refresh(self) -> None:
+        """Cancel any scheduled background refresh."""
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+    
+    @callback
+    def async_unload(self) -> None:
+        """Stop refreshing, including after any refresh already in flight."""
+        self._unloaded = True
+        self.async_cancel_refresh()
+    
+    async def _async_scheduled_refresh(self, _now: datetime) -> None:
+        """Run a scheduled background refresh."""
+        self._unsub_refresh = None
+        try:
+            await self.async_refresh_token()
+        except InvalidAuth:
+            self.entry.async_start_reauth(self.hass)
+    
     def get_id_token(self) -> str | None:
-        """Get the current ID token."""
+        """Get the current ID token, kept fresh by the background refresh."""
         if not self._id_token:
             _LOGGER.error("No ID token available")
             return None
-        
-        # Refresh if needed
-        self.refresh_token()
-        
         return self._id_token
 
 
@@ -344,22 +519,37 @@ class HiveScheduleAPI:
     
     BASE_URL = "https://beekeeper-uk.hivehome.com/1.0"
     
-    def __init__(self, auth: HiveAuth) -> None:
+    __slots__ = ("auth", "_breaker", "_session_token", "_http", "_headers")
+    
+    def __init__(self, hass: HomeAssistant, auth: HiveAuth) -> None:
         """Initialize the API client."""
         self.auth = auth
-        self.session = requests.Session()
-        self.session.headers.update({
+        self._breaker = _CircuitBreaker()
+        self._session_token = None
+        # Home Assistant's shared aiohttp session (pooled, keep-alive)
+        self._http = async_get_clientsession(hass)
+        self._headers = {
             "Content-Type": "application/json",
             "Accept": "*/*",
             "Origin": "https://my.hivehome.com",
             "Referer": "https://my.hivehome.com/"
-        })
+        }
+    
+    def _set_session_token(self, token: str) -> None:
+        """Set the Authorization header if the token has changed."""
+        if token != self._session_token:
+            self._headers["Authorization"] = token
+            self._session_token = token
     
     @staticmethod
     def time_to_minutes(time_str: str) -> int:
         """Convert time string to minutes from midnight."""
-        h, m = map(int, time_str.split(":"))
-        return h * 60 + m
+        try:
+            return _TIME_TO_MINUTES[time_str]
+        except KeyError:
+            # Non-canonical input such as "6:30"
+            h, m = map(int, time_str.split(":"))
+            return h * 60 + m
     
     @staticmethod
     def minutes_to_time(minutes: int) -> str:
@@ -377,13 +567,20 @@ class HiveScheduleAPI:
     
     def _log_api_call(self, method: str, url: str, headers: dict, payload: dict | None = None) -> None:
         """Log detailed API call information for debugging."""
-        _LOGGER.debug("=" * 80)
-        _LOGGER.debug("API CALL DEBUG INFO")
-        _LOGGER.debug("=" * 80)
-        _LOGGER.debug("Method: %s", method)
-        _LOGGER.debug("URL: %s", url)
-        _LOGGER.debug("-" * 80)
-        _LOGGER.debug("Headers:")
+        # Skip the header copy and JSON encoding unless it will be emitted
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        
+        # Build the whole report and emit it as one record
+        lines = [
+            _BANNER,
+            "API CALL DEBUG INFO",
+            _BANNER,
+            f"Method: {method}",
+            f"URL: {url}",
+            _RULE,
+            "Headers:",
+        ]
         # Sanitize authorization header for logging
         safe_headers = headers.copy()
         if "Authorization" in safe_headers:
@@ -391,38 +588,54 @@ class HiveScheduleAPI:
             if len(token) > 20:
                 safe_headers["Authorization"] = f"{token[:10]}...{token[-10:]}"
         for key, value in safe_headers.items():
-            _LOGGER.debug("  %s: %s", key, value)
-        _LOGGER.debug("-" * 80)
+            lines.append(f"  {key}: {value}")
+        lines.append(_RULE)
         if payload:
-            _LOGGER.debug("Payload (JSON):")
-            _LOGGER.debug("%s", json.dumps(payload, indent=2))
-        _LOGGER.debug("=" * 80)
+            lines.append("Payload (JSON):")
+            lines.append(json.dumps(payload, indent=2))
+        lines.append(_BANNER)
+        _LOGGER.debug("%s", "\n".join(lines))
     
     def _format_schedule_readable(self, schedule_data: dict, title: str = "SCHEDULE IN READABLE FORMAT") -> None:
-        """Format and log schedule data in a human-readable way."""
+        """Format and log schedule data in a human-readable way.
+        
+        Callers only parse the data when INFO is enabled, so no level check
+        is repeated here.
+        """
         if not schedule_data or "schedule" not in schedule_data:
             return
         
         schedule = schedule_data["schedule"]
         
-        _LOGGER.info("=" * 80)
-        _LOGGER.info(title)
-        _LOGGER.info("=" * 80)
+        # Build the whole schedule and emit it as one record
+        lines = [_BANNER, title, _BANNER]
         
-        for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
+        for day in _DAYS:
             if day in schedule:
                 entries = schedule[day]
-                _LOGGER.info(f"{day.upper()}:")
+                lines.append(f"{day.upper()}:")
                 for entry in entries:
                     time_str = self.minutes_to_time(entry["start"])
                     temp = entry["value"]["target"]
-                    _LOGGER.info(f"  {time_str} → {temp}°C")
+                    lines.append(f"  {time_str} → {temp}°C")
         
-        _LOGGER.info("=" * 80)
+        lines.append(_BANNER)
+        _LOGGER.info("%s", "\n".join(lines))
+    
+    async def _async_post(self, url: str, payload: dict[str, Any]) -> tuple[int, bytes]:
+        """POST a payload to the Hive API and return the status and raw body."""
+        self._log_api_call("POST", url, self._headers, payload)
+        async with self._http.post(
+            url, json=payload, headers=self._headers, timeout=REQUEST_TIMEOUT
+        ) as response:
+            return response.status, await response.read()
     
-    def update_schedule(self, node_id: str, schedule_data: dict[str, Any]) -> bool:
+    async def async_update_schedule(self, node_id: str, schedule_data: dict[str, Any]) -> bool:
         """Send schedule update to Hive using beekeeper-uk API."""
-        # Get fresh token
+        # Fail fast while the Hive API is known to be down
+        self._breaker.check()
+        
+        # Get fresh token (authentication is not guarded by the breaker)
         token = self.auth.get_id_token()
         
         if not token:
@@ -430,88 +643,95 @@ class HiveScheduleAPI:
             raise HomeAssistantError("Failed to authenticate with Hive")
         
         # Update session header with current token
-        self.session.headers["Authorization"] = token
+        self._set_session_token(token)
         
         url = f"{self.BASE_URL}/nodes/heating/{node_id}"
         
+        # Branch on the status code rather than raising for non-2xx
+        # responses, so expected errors don't build and unwind exceptions
         try:
-            # Log the API call details
-            self._log_api_call("POST", url, self.session.headers, schedule_data)
-            
             _LOGGER.info("Sending schedule update to %s", url)
+            status, response_body = await self._async_post(url, schedule_data)
             
-            response = self.session.post(url, json=schedule_data, timeout=30)
-            response.raise_for_status()
-            
-            _LOGGER.debug("Response status: %s", response.status_code)
-            _LOGGER.debug("Response text: %s", response.text[:2000] if hasattr(response, 'text') else 'no response')
-            
-            # Parse and format the response to show what was actually set
-            try:
-                response_data = response.json()
-                _LOGGER.info("Response from Hive API (showing what was set):")
-                self._format_schedule_readable(response_data, "UPDATED SCHEDULE (confirmed by Hive)")
-            except Exception as e:
-                _LOGGER.debug(f"Could not parse response for readable format: {e}")
-            
-            _LOGGER.info("✓ Successfully updated Hive schedule for node %s", node_id)
-            return True
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == 401:
+            if status == 401:
                 _LOGGER.error("Authentication failed (401)")
-                _LOGGER.error("Response: %s", err.response.text[:200] if hasattr(err.response, 'text') else 'no response')
+                _LOGGER.error("Response: %s", response_body[:200].decode("utf-8", "replace"))
                 
                 # Try to refresh token and retry once
                 _LOGGER.info("Attempting to refresh token and retry...")
-                if self.auth.refresh_token():
-                    token = self.auth.get_id_token()
-                    self.session.headers["Authorization"] = token
-                    try:
-                        self._log_api_call("POST", url, self.session.headers, schedule_data)
-                        response = self.session.post(url, json=schedule_data, timeout=30)
-                        response.raise_for_status()
-                        _LOGGER.info("✓ Successfully updated Hive schedule after token refresh")
-                        
-                        try:
-                            response_data = response.json()
-                            self._format_schedule_readable(response_data, "UPDATED SCHEDULE (confirmed by Hive)")
-                        except:
-                            pass
-                        
-                        return True
-                    except Exception as retry_err:
-                        _LOGGER.error("Retry failed: %s", retry_err)
-                
-                raise HomeAssistantError("Hive authentication failed") from err
-            if err.response.status_code == 404:
-                _LOGGER.error("Node ID not found: %s", node_id)
-                raise HomeAssistantError(f"Invalid node ID: {node_id}") from err
-            _LOGGER.error("HTTP error updating schedule: %s", err)
-            if hasattr(err.response, 'text'):
-                _LOGGER.error("Response: %s", err.response.text[:500])
-            raise HomeAssistantError(f"Failed to update schedule: {err}") from err
-        except requests.exceptions.Timeout as err:
+                # Force it: the monotonic deadline can still look valid, e.g.
+                # after the host was suspended
+                try:
+                    refreshed = await self.auth.async_refresh_token(force=True)
+                except InvalidAuth as err:
+                    self.auth.entry.async_start_reauth(self.auth.hass)
+                    raise HomeAssistantError("Hive authentication failed") from err
+                if refreshed:
+                    self._set_session_token(self.auth.get_id_token())
+                    status, response_body = await self._async_post(url, schedule_data)
+                    if status == 401:
+                        _LOGGER.error("Retry failed: still unauthorized")
+        except asyncio.TimeoutError as err:
+            self._breaker.record_failure()
             _LOGGER.error("Request to Hive API timed out")
             raise HomeAssistantError("Hive API request timed out") from err
-        except requests.exceptions.RequestException as err:
+        except aiohttp.ClientError as err:
+            self._breaker.record_failure()
             _LOGGER.error("Request error updating schedule: %s", err)
             raise HomeAssistantError(f"Failed to update schedule: {err}") from err
+        
+        # Any non-5xx answer means Hive is reachable, which closes the breaker
+        # (and ends a half-open probe) even when the request was rejected
+        if status >= 500:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        
+        if status == 401:
+            raise HomeAssistantError("Hive authentication failed")
+        if status == 404:
+            _LOGGER.error("Node ID not found: %s", node_id)
+            raise HomeAssistantError(f"Invalid node ID: {node_id}")
+        if status >= 400:
+            _LOGGER.error("HTTP error updating schedule: %s", status)
+            _LOGGER.error("Response: %s", response_body[:500].decode("utf-8", "replace"))
+            raise HomeAssistantError(f"Failed to update schedule: HTTP {status}")
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Response status: %s", status)
+            _LOGGER.debug("Response body: %s", response_body[:2000].decode("utf-8", "replace"))
+        
+        # Parse and format the response to show what was actually set; the
+        # parse is only for this log output, so skip it unless INFO is on
+        if _LOGGER.isEnabledFor(logging.INFO):
+            try:
+                response_data = json_loads(response_body)
+                _LOGGER.info("Response from Hive API (showing what was set):")
+                self._format_schedule_readable(response_data, "UPDATED SCHEDULE (confirmed by Hive)")
+            except Exception as e:
+                _LOGGER.debug("Could not parse response for readable format: %s", e)
+        
+        _LOGGER.info("✓ Successfully updated Hive schedule for node %s", node_id)
+        return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hive Schedule Manager from a config entry."""
     
-    _LOGGER.info("=" * 80)
+    _LOGGER.info(_BANNER)
     _LOGGER.info("Hive Schedule Manager v1.1.17 Production")
     _LOGGER.info("POST-based schedule updates with YAML profiles")
-    _LOGGER.info("=" * 80)
+    _LOGGER.info(_BANNER)
     
     # Initialize authentication and API
     auth = HiveAuth(hass, entry)
-    api = HiveScheduleAPI(auth)
+    api = HiveScheduleAPI(hass, auth)
+    
+    # Resolve the profiles path once; it is re-read on every service call
+    profiles_path = hass.config.path(PROFILES_FILE)
     
     # Load profiles asynchronously
-    profiles = await _load_profiles(hass)
+    profiles = await _load_profiles(profiles_path)
     _LOGGER.info("Loaded %d schedule profiles", len(profiles))
     
     # Check if we have tokens
@@ -519,8 +739,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.warning("No authentication tokens found in config entry")
     else:
         _LOGGER.info("Loaded authentication tokens from config entry")
-        # Try to refresh token to ensure it's valid
-        await hass.async_add_executor_job(auth.refresh_token)
+        # Try to refresh token to ensure it's valid; this also schedules
+        # the next background refresh ahead of expiry
+        try:
+            await auth.async_refresh_token()
+        except InvalidAuth as err:
+            # Home Assistant starts the reauth flow for us
+            raise ConfigEntryAuthFailed("Hive refresh token rejected") from err
+    
+    entry.async_on_unload(auth.async_unload)
     
     # Store in hass.data
     hass.data.setdefault(DOMAIN, {})
@@ -530,14 +757,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "profiles": profiles,
     }
     
-    # Set up periodic token refresh
-    async def refresh_token_periodic(now=None):
-        """Periodically refresh the authentication token."""
-        await hass.async_add_executor_job(auth.refresh_token)
-    
-    entry.async_on_unload(
-        async_track_time_interval(hass, refresh_token_periodic, DEFAULT_SCAN_INTERVAL)
-    )
+    async def _do_set_day(node_id: str, day: str, day_schedule: list[dict]) -> None:
+        """Validate a day schedule and send it to Hive for a single day."""
+        # Validate schedule
+        try:
+            _validate_schedule(day_schedule)
+        except ValueError as err:
+            raise HomeAssistantError(f"Invalid schedule: {err}") from err
+        
+        _LOGGER.info("Setting schedule for %s on node %s", day, node_id)
+        
+        # Build schedule with ONLY the selected day (beekeeper format)
+        schedule_data = {
+            "schedule": {
+                day: [
+                    api.build_schedule_entry(entry["time"], entry["temp"])
+                    for entry in day_schedule
+                ]
+            }
+        }
+        
+        # Send updated schedule to Hive
+        await api.async_update_schedule(node_id, schedule_data)
+        
+        _LOGGER.info("Successfully updated %s schedule", day)
     
     # Service: Set day schedule
     async def handle_set_day(call: ServiceCall) -> None:
@@ -548,7 +791,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         custom_schedule = call.data.get(ATTR_SCHEDULE)
         
         # Reload profiles to pick up any changes (async)
-        profiles = await _load_profiles(hass)
+        profiles = await _load_profiles(profiles_path)
         
         # Determine which schedule to use
         if profile and custom_schedule:
@@ -567,28 +810,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "Either 'profile' or 'schedule' must be provided"
             )
         
-        # Validate schedule
-        try:
-            _validate_schedule(day_schedule)
-        except ValueError as err:
-            raise HomeAssistantError(f"Invalid schedule: {err}") from err
-        
-        _LOGGER.info("Setting schedule for %s on node %s", day, node_id)
-        
-        # Build schedule with ONLY the selected day (beekeeper format)
-        schedule_data = {
-            "schedule": {
-                day: [
-                    api.build_schedule_entry(entry["time"], entry["temp"])
-                    for entry in day_schedule
-                ]
-            }
-        }
-        
-        # Send updated schedule to Hive
-        await hass.async_add_executor_job(api.update_schedule, node_id, schedule_data)
-        
-        _LOGGER.info("Successfully updated %s schedule", day)
+        await _do_set_day(node_id, day, day_schedule)
     
     # Register service
     hass.services.async_register(
@@ -599,7 +821,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     
     _LOGGER.info("Hive Schedule Manager setup complete")
-    _LOGGER.info("Profiles file: %s", hass.config.path(PROFILES_FILE))
+    _LOGGER.info("Profiles file: %s", profiles_path)
     return True
 
 
@@ -0,0 +1,65 @@
+"""Shared AWS Cognito helpers for the Hive Schedule Manager integration."""
+from __future__ import annotations
+
+import functools
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+import boto3
+from botocore import UNSIGNED
+from botocore.config import Config
+
+from .const import COGNITO_REGION
+
+# Used when Cognito omits ExpiresIn; its ID tokens last an hour
+DEFAULT_TOKEN_LIFETIME = 3600
+
+# Hive only uses unauthenticated Cognito calls (InitiateAuth,
+# RespondToAuthChallenge), so skip request signing and the credential
+# chain lookup. Retries are bounded so an outage fails fast.
+BOTOCORE_CONFIG = Config(
+    region_name=COGNITO_REGION,
+    signature_version=UNSIGNED,
+    retries={"max_attempts": 2},
+)
+
+# boto3 Sessions are not thread-safe, so clients are created under a lock
+_CLIENT_LOCK = threading.Lock()
+_IDP_CLIENTS: dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def get_boto3_session() -> boto3.Session:
+    """Get the boto3 session shared by all Cognito clients.
+
+    Clients created from one session reuse its loaded service models and
+    endpoint data instead of loading them again. Blocking; call from the
+    executor, holding _CLIENT_LOCK.
+    """
+    return boto3.Session()
+
+
+def get_idp_client(region: str = COGNITO_REGION) -> Any:
+    """Get the shared cognito-idp client for a region.
+
+    botocore clients are thread-safe and the Cognito calls used here carry
+    no per-user state, so one client serves every entry and config flow.
+    Blocking on first use; call from the executor.
+    """
+    client = _IDP_CLIENTS.get(region)
+    if client is None:
+        with _CLIENT_LOCK:
+            # Another executor thread may have created it while we waited
+            client = _IDP_CLIENTS.get(region)
+            if client is None:
+                client = _IDP_CLIENTS[region] = get_boto3_session().client(
+                    "cognito-idp", region_name=region, config=BOTOCORE_CONFIG
+                )
+    return client
+
+
+def auth_result_expiry(auth_result: dict[str, Any]) -> datetime:
+    """Get the expiry time of the tokens in a Cognito AuthenticationResult."""
+    expires_in = auth_result.get("ExpiresIn", DEFAULT_TOKEN_LIFETIME)
+    return datetime.now() + timedelta(seconds=expires_in)
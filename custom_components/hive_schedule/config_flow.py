@@ -2,32 +2,46 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from typing import Any
-from datetime import datetime, timedelta
 
 import voluptuous as vol
-from pycognito import Cognito
-from pycognito.exceptions import SMSMFAChallengeException
-from botocore.exceptions import ClientError
+from pycognito.aws_srp import AWSSRP
+from botocore.exceptions import (
+    ClientError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError,
+)
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_USERNAME, CONF_PASSWORD
 from homeassistant.data_entry_flow import FlowResult
 
+from .cognito import auth_result_expiry, get_idp_client
 from .const import (
     DOMAIN,
     COGNITO_POOL_ID,
     COGNITO_CLIENT_ID,
-    COGNITO_REGION,
     CONF_MFA_CODE,
     CONF_ID_TOKEN,
     CONF_ACCESS_TOKEN,
     CONF_REFRESH_TOKEN,
     CONF_TOKEN_EXPIRY,
 )
+from .exceptions import CannotConnect, InvalidAuth
 
 _LOGGER = logging.getLogger(__name__)
 
+USER_SCHEMA = vol.Schema({
+    vol.Required(CONF_USERNAME): str,
+    vol.Required(CONF_PASSWORD): str,
+})
+
+MFA_SCHEMA = vol.Schema({
+    vol.Required(CONF_MFA_CODE): str,
+})
+
 
 class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Hive Schedule Manager."""
@@ -39,8 +53,8 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._username = None
         self._password = None
         self._session_token = None
-        self._cognito = None
         self._auth_result = None
+        self._existing_entry = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -52,6 +66,12 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._username = user_input[CONF_USERNAME]
             self._password = user_input[CONF_PASSWORD]
 
+            # Claim the unique ID before any Cognito call, so a duplicate
+            # flow for this account aborts without a network round trip
+            self._existing_entry = await self.async_set_unique_id(
+                self._username.lower()
+            )
+
             try:
                 # Try to authenticate
                 result = await self.hass.async_add_executor_job(
@@ -79,13 +99,16 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required(CONF_USERNAME): str,
-                vol.Required(CONF_PASSWORD): str,
-            }),
+            data_schema=USER_SCHEMA,
             errors=errors,
         )
 
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> FlowResult:
+        """Handle re-authentication after the refresh token is rejected."""
+        return await self.async_step_user()
+
     async def async_step_mfa(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -116,9 +139,7 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="mfa",
-            data_schema=vol.Schema({
-                vol.Required(CONF_MFA_CODE): str,
-            }),
+            data_schema=MFA_SCHEMA,
             errors=errors,
             description_placeholders={
                 "username": self._username,
@@ -138,13 +159,14 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             entry_data[CONF_ID_TOKEN] = self._auth_result.get('IdToken', '')
             entry_data[CONF_ACCESS_TOKEN] = self._auth_result.get('AccessToken', '')
             entry_data[CONF_REFRESH_TOKEN] = self._auth_result.get('RefreshToken', '')
-            # Token expires in ~1 hour, store expiry time
-            expiry = (datetime.now() + timedelta(minutes=55)).isoformat()
+            # Store the expiry Cognito reported so setup can reuse these
+            # tokens instead of logging in again
+            expiry = auth_result_expiry(self._auth_result).isoformat()
             entry_data[CONF_TOKEN_EXPIRY] = expiry
             _LOGGER.debug("Stored authentication tokens in config entry")
         
         # Check if entry already exists
-        existing_entry = await self.async_set_unique_id(self._username.lower())
+        existing_entry = self._existing_entry
         
         if existing_entry:
             # Update existing entry
@@ -167,31 +189,45 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def _try_authenticate(self) -> dict[str, Any]:
         """Try to authenticate - returns status dict."""
         try:
-            self._cognito = Cognito(
-                user_pool_id=COGNITO_POOL_ID,
+            client = get_idp_client()
+            srp = AWSSRP(
+                username=self._username,
+                password=self._password,
+                pool_id=COGNITO_POOL_ID,
                 client_id=COGNITO_CLIENT_ID,
-                user_pool_region=COGNITO_REGION,
-                username=self._username
+                client=client,
             )
             
-            try:
-                self._cognito.authenticate(password=self._password)
+            # Drive the SRP exchange directly so MFA shows up as a
+            # ChallengeName rather than an exception to unpack
+            auth_params = srp.get_auth_params()
+            response = client.initiate_auth(
+                ClientId=COGNITO_CLIENT_ID,
+                AuthFlow="USER_SRP_AUTH",
+                AuthParameters=auth_params,
+            )
+            if response.get("ChallengeName") == "PASSWORD_VERIFIER":
+                response = client.respond_to_auth_challenge(
+                    ClientId=COGNITO_CLIENT_ID,
+                    ChallengeName="PASSWORD_VERIFIER",
+                    ChallengeResponses=srp.process_challenge(
+                        response["ChallengeParameters"], auth_params
+                    ),
+                )
+            
+            if response.get("ChallengeName") == "SMS_MFA":
+                _LOGGER.info("MFA required - SMS code sent to registered phone")
+                self._session_token = response.get("Session")
+                return {"mfa_required": True}
+            
+            if "AuthenticationResult" in response:
                 # Success without MFA - store tokens
                 _LOGGER.info("Authentication successful without MFA")
-                self._auth_result = {
-                    'IdToken': self._cognito.id_token,
-                    'AccessToken': self._cognito.access_token,
-                    'RefreshToken': self._cognito.refresh_token,
-                }
+                self._auth_result = response["AuthenticationResult"]
                 return {"success": True}
-                
-            except SMSMFAChallengeException as mfa_error:
-                _LOGGER.info("MFA required - SMS code sent to registered phone")
-                # Extract session token from the exception
-                if len(mfa_error.args) > 1 and isinstance(mfa_error.args[1], dict):
-                    self._session_token = mfa_error.args[1].get('Session')
-                    _LOGGER.debug("MFA session token extracted")
-                return {"mfa_required": True}
+            
+            _LOGGER.error("Unsupported Cognito challenge: %s", response.get("ChallengeName"))
+            return {"success": False}
                 
         except ClientError as err:
             error_code = err.response.get("Error", {}).get("Code", "")
@@ -205,6 +241,11 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 raise InvalidAuth
             else:
                 raise CannotConnect
+        
+        except (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError) as err:
+            # Expected network failures; no traceback needed
+            _LOGGER.warning("Cognito transport error: %s", err)
+            raise CannotConnect from err
                 
         except Exception as err:
             _LOGGER.exception("Unexpected exception during auth: %s", err)
@@ -213,15 +254,13 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def _verify_mfa(self, mfa_code: str) -> dict[str, Any]:
         """Verify MFA code - returns status dict with tokens."""
         try:
-            if not self._cognito or not self._session_token:
+            if not self._session_token:
                 _LOGGER.error("No MFA session available for verification")
                 return {"success": False}
             
             _LOGGER.debug("Verifying MFA code...")
             
-            # Use boto3 client directly to respond to MFA challenge
-            client = self._cognito.client
-            response = client.respond_to_auth_challenge(
+            response = get_idp_client().respond_to_auth_challenge(
                 ClientId=COGNITO_CLIENT_ID,
                 ChallengeName='SMS_MFA',
                 Session=self._session_token,
@@ -255,11 +294,3 @@ class HiveScheduleConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as err:
             _LOGGER.exception("Unexpected error during MFA verification: %s", err)
             return {"success": False}
-
-
-class CannotConnect(Exception):
-    """Error to indicate we cannot connect."""
-
-
-class InvalidAuth(Exception):
-    """Error to indicate there is invalid auth."""
\ No newline at end of file
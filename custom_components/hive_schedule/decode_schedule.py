@@ -13,6 +13,10 @@ Example input:
 import json
 import sys
 
+BANNER = "=" * 60
+RULE = "-" * 60
+DAY_RULE = "-" * 40
+
 
 def minutes_to_time(minutes):
     """Convert minutes from midnight to HH:MM format."""
@@ -32,20 +36,20 @@ def decode_schedule(schedule_json):
         
         schedule = data["schedule"]
         
-        print("\n" + "=" * 60)
+        print("\n" + BANNER)
         print("DECODED SCHEDULE")
-        print("=" * 60)
+        print(BANNER)
         
         for day, entries in schedule.items():
             print(f"\n{day.upper()}:")
-            print("-" * 40)
+            print(DAY_RULE)
             
             for entry in entries:
                 time = minutes_to_time(entry["start"])
                 temp = entry["value"]["target"]
                 print(f"  {time} → {temp}°C")
         
-        print("\n" + "=" * 60)
+        print("\n" + BANNER)
         
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON - {e}")
@@ -57,10 +61,10 @@ def decode_schedule(schedule_json):
 
 def main():
     print("Hive Schedule Decoder")
-    print("=" * 60)
+    print(BANNER)
     print("Paste your schedule JSON from the logs (Ctrl+D when done):")
     print("Example: {\"schedule\":{\"monday\":[{\"value\":{\"target\":18.5},\"start\":330}]}}")
-    print("-" * 60)
+    print(RULE)
     
     try:
         schedule_json = sys.stdin.read().strip()
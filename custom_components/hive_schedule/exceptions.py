@@ -0,0 +1,9 @@
+"""Exceptions for the Hive Schedule Manager integration."""
+
+
+class CannotConnect(Exception):
+    """Error to indicate we cannot connect."""
+
+
+class InvalidAuth(Exception):
+    """Error to indicate there is invalid auth."""